@@ -1,12 +1,23 @@
 from __future__ import annotations
 
+import csv
+import io
+import logging
 import os
+import threading
+from contextlib import contextmanager
+
 import psycopg2
-from typing import Any, Dict
+from psycopg2.extras import execute_values
+from psycopg2.pool import ThreadedConnectionPool
+from typing import Any, Dict, Iterable, Iterator, List, Set, Tuple
+from uuid import uuid4
 
 from leetcode.problem import Problem
 from leetcode.study_plan import StudyPlan
 
+logger = logging.getLogger(__name__)
+
 
 def _create_study_plan_from_result(result) -> StudyPlan:
     """
@@ -14,20 +25,16 @@ def _create_study_plan_from_result(result) -> StudyPlan:
     :param result: A tuple representing a row from the database query.
     :return: A StudyPlan object.
     """
-    slug = result[0]
-    name = result[1]
-    description = result[2]
-    expected_number_of_problems = result[3]
-    number_of_problems = result[4] if len(result) > 4 else None
-    number_of_categories = result[5] if len(result) > 5 else None
-
+    # Rows always arrive in the fixed six-column shape (slug, name,
+    # description, expected_number_of_problems, number_of_problems,
+    # number_of_categories), so no per-row width checks are needed.
     return StudyPlan(
-        slug=slug,
-        name=name,
-        description=description,
-        expected_number_of_problems=expected_number_of_problems,
-        number_of_problems=number_of_problems,
-        number_of_categories=number_of_categories,
+        result[1],
+        result[0],
+        result[2],
+        result[3],
+        result[4],
+        result[5],
     )
 
 
@@ -37,30 +44,283 @@ def _create_problem_from_result(result) -> Problem:
     :param result: A tuple representing a row from the database query.
     :return: A Problem object.
     """
-    problem_id = int(result[0])
-    title = result[1]
-    content = result[2]
-    difficulty = result[3]
-    topics = result[4] if result[4] else []
-    companies = result[5] if result[5] else []
-    hints = result[6] if result[6] else []
-
+    # Positional construction: keyword binding is measurable overhead when
+    # this runs once per row of a large result set. Arrays stay lists (not
+    # tuples) because psycopg2 adapts tuples as records, not ARRAYs.
     return Problem(
-        id=problem_id,
-        title=title,
-        content=content,
-        difficulty=difficulty,
-        topics=topics,
-        companies=companies,
-        hints=hints,
+        int(result[0]),
+        result[1],
+        result[2],
+        result[3],
+        result[4] or [],
+        result[5] or [],
+        result[6] or [],
+        result[7],
     )
 
 
+# Pre-bound constructor reference for the bulk fetch paths, which inline the
+# row-to-object step to skip one Python function frame per row.
+_MAKE_PROBLEM = Problem
+
+
+# Shared connection pool so Database instances reuse warm Postgres backends
+# instead of paying TCP + TLS + auth setup on every instantiation. Created
+# lazily so importing this module does not require a reachable database.
+_POOL: ThreadedConnectionPool | None = None
+_POOL_LOCK = threading.Lock()
+
+
+def _get_pool(maxconn: int | None = None) -> ThreadedConnectionPool:
+    """
+    Get the shared connection pool, creating it on first use.
+    :param maxconn: A floor for the pool size when the pool is first created.
+    :return: The shared ThreadedConnectionPool.
+    """
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            # Each thread keeps its checkout until Database.close(), and
+            # getconn() raises PoolError rather than blocking when the pool
+            # runs dry, so maxconn must cover every thread that touches the
+            # database concurrently: the I/O workers, the db-writer thread,
+            # and the main thread. LeetCode sizes this through
+            # ensure_pool_capacity from its io_concurrency.
+            _POOL = ThreadedConnectionPool(
+                minconn=1,
+                maxconn=max(int(os.getenv("PG_POOL_MAX", "34")), maxconn or 0),
+                dbname=os.getenv("POSTGRES_DB"),
+                user=os.getenv("POSTGRES_USER"),
+                password=os.getenv("POSTGRES_PASSWORD"),
+                host=os.getenv("POSTGRES_HOST"),
+                port=os.getenv("POSTGRES_PORT"),
+            )
+    return _POOL
+
+
+# Hot single-row lookups are prepared server-side once per connection so
+# Postgres does not re-parse/re-plan the same SQL text on every call.
+_PREPARED_STATEMENTS = {
+    "problem_by_slug": (
+        "SELECT id, title, content, difficulty, topics, companies, hints, slug "
+        "FROM leetcode.problems WHERE slug = $1"
+    ),
+    "problem_exists": "SELECT EXISTS(SELECT 1 FROM leetcode.problems WHERE slug = $1)",
+    "study_plan_exists": (
+        "SELECT EXISTS(SELECT 1 FROM leetcode.study_plans WHERE slug = $1)"
+    ),
+    "company_exists": "SELECT EXISTS(SELECT 1 FROM leetcode.companies WHERE name = $1)",
+}
+
+
+# All SQL lives here as module-level constants so each statement string is
+# built once at import instead of being re-materialized on every call, and
+# psycopg2's query-adaptation caching always sees the same object.
+_SQL_INSERT_PROBLEM = """
+INSERT INTO leetcode.problems (question_id, title, slug, content, difficulty, topics, companies, hints, link)
+VALUES (%(id)s, %(title)s, %(slug)s, %(content)s, %(difficulty)s, %(topics)s, %(companies)s, %(hints)s, %(link)s)
+ON CONFLICT (question_id) DO UPDATE
+SET title = EXCLUDED.title,
+    slug = EXCLUDED.slug,
+    content = EXCLUDED.content,
+    difficulty = EXCLUDED.difficulty,
+    topics = EXCLUDED.topics,
+    companies = EXCLUDED.companies,
+    hints = EXCLUDED.hints,
+    link = EXCLUDED.link
+RETURNING id;
+"""
+
+_SQL_INSERT_PROBLEMS = """
+INSERT INTO leetcode.problems (question_id, title, slug, content, difficulty, topics, companies, hints, link)
+SELECT t.question_id, t.title, t.slug, t.content, t.difficulty,
+       t.topics::text[], t.companies::text[], t.hints::text[], t.link
+FROM unnest(
+    %(question_ids)s::int[], %(titles)s::text[], %(slugs)s::text[],
+    %(contents)s::text[], %(difficulties)s::text[], %(topics)s::text[],
+    %(companies)s::text[], %(hints)s::text[], %(links)s::text[]
+) AS t(question_id, title, slug, content, difficulty, topics, companies, hints, link)
+ON CONFLICT (question_id) DO UPDATE
+SET title = EXCLUDED.title,
+    slug = EXCLUDED.slug,
+    content = EXCLUDED.content,
+    difficulty = EXCLUDED.difficulty,
+    topics = EXCLUDED.topics,
+    companies = EXCLUDED.companies,
+    hints = EXCLUDED.hints,
+    link = EXCLUDED.link
+RETURNING id, question_id;
+"""
+
+_SQL_CREATE_TMP_PROBLEMS = """
+CREATE TEMP TABLE tmp_problems
+(LIKE leetcode.problems INCLUDING DEFAULTS EXCLUDING CONSTRAINTS)
+ON COMMIT DROP;
+ALTER TABLE tmp_problems DROP COLUMN id;
+"""
+
+_SQL_COPY_TMP_PROBLEMS = """
+COPY tmp_problems (question_id, title, slug, content, difficulty, topics, companies, hints, link)
+FROM STDIN WITH CSV
+"""
+
+_SQL_MERGE_TMP_PROBLEMS = """
+INSERT INTO leetcode.problems (question_id, title, slug, content, difficulty, topics, companies, hints, link)
+SELECT question_id, title, slug, content, difficulty, topics, companies, hints, link
+FROM tmp_problems
+ON CONFLICT (question_id) DO UPDATE
+SET title = EXCLUDED.title,
+    slug = EXCLUDED.slug,
+    content = EXCLUDED.content,
+    difficulty = EXCLUDED.difficulty,
+    topics = EXCLUDED.topics,
+    companies = EXCLUDED.companies,
+    hints = EXCLUDED.hints,
+    link = EXCLUDED.link;
+"""
+
+_SQL_INSERT_STUDY_PLAN = """
+INSERT INTO leetcode.study_plans (slug, name, description, expected_number_of_problems)
+VALUES (%(slug)s, %(name)s, %(description)s, %(expected_number_of_problems)s)
+ON CONFLICT (slug) DO UPDATE
+SET name = EXCLUDED.name,
+    description = EXCLUDED.description,
+    expected_number_of_problems = EXCLUDED.expected_number_of_problems
+RETURNING id;
+"""
+
+_SQL_INSERT_STUDY_PLAN_PROBLEMS = """
+INSERT INTO leetcode.study_plan_problems (study_plan_id, problem_id, category_name)
+VALUES %s
+ON CONFLICT (study_plan_id, problem_id) DO UPDATE
+SET category_name = EXCLUDED.category_name;
+"""
+
+_SQL_INSERT_STUDY_PLAN_BUNDLE = """
+WITH sp AS (
+    INSERT INTO leetcode.study_plans (slug, name, description, expected_number_of_problems)
+    VALUES (%(slug)s, %(name)s, %(description)s, %(expected_number_of_problems)s)
+    ON CONFLICT (slug) DO UPDATE
+    SET name = EXCLUDED.name,
+        description = EXCLUDED.description,
+        expected_number_of_problems = EXCLUDED.expected_number_of_problems
+    RETURNING id
+),
+p AS (
+    INSERT INTO leetcode.problems (question_id, title, slug, content, difficulty, topics, companies, hints, link)
+    SELECT t.question_id, t.title, t.slug, t.content, t.difficulty,
+           t.topics::text[], t.companies::text[], t.hints::text[], t.link
+    FROM unnest(
+        %(question_ids)s::int[], %(titles)s::text[], %(slugs)s::text[],
+        %(contents)s::text[], %(difficulties)s::text[], %(topics)s::text[],
+        %(companies)s::text[], %(hints)s::text[], %(links)s::text[]
+    ) AS t(question_id, title, slug, content, difficulty, topics, companies, hints, link)
+    ON CONFLICT (question_id) DO UPDATE
+    SET title = EXCLUDED.title,
+        slug = EXCLUDED.slug,
+        content = EXCLUDED.content,
+        difficulty = EXCLUDED.difficulty,
+        topics = EXCLUDED.topics,
+        companies = EXCLUDED.companies,
+        hints = EXCLUDED.hints,
+        link = EXCLUDED.link
+    RETURNING id, question_id
+),
+cat AS (
+    SELECT * FROM unnest(%(category_question_ids)s::int[], %(category_names)s::text[])
+    AS c(question_id, category_name)
+),
+spp AS (
+    INSERT INTO leetcode.study_plan_problems (study_plan_id, problem_id, category_name)
+    SELECT sp.id, p.id, cat.category_name
+    FROM sp, p
+    JOIN cat ON cat.question_id = p.question_id
+    ON CONFLICT (study_plan_id, problem_id) DO UPDATE
+    SET category_name = EXCLUDED.category_name
+)
+SELECT id FROM sp;
+"""
+
+_SQL_STUDY_PLAN_BY_SLUG = """
+SELECT sp.slug, sp.name, sp.description, sp.expected_number_of_problems,
+       COALESCE(COUNT(DISTINCT spp.problem_id), 0) AS number_of_problems,
+       COALESCE(COUNT(DISTINCT spp.category_name), 0) AS number_of_categories
+FROM leetcode.study_plans sp
+LEFT JOIN leetcode.study_plan_problems spp ON sp.id = spp.study_plan_id
+WHERE sp.slug = %(slug)s
+GROUP BY sp.slug, sp.name, sp.description, sp.expected_number_of_problems;
+"""
+
+
+_SQL_PROBLEMS_BY_STUDY_PLAN = """
+SELECT p.id, p.title, p.content, p.difficulty, p.topics, p.companies, p.hints,
+       p.slug
+FROM leetcode.problems p
+JOIN leetcode.study_plan_problems spp ON p.id = spp.problem_id
+JOIN leetcode.study_plans sp ON spp.study_plan_id = sp.id
+WHERE sp.slug = %(slug)s;
+"""
+
+_SQL_EXISTING_PROBLEM_SLUGS = """
+SELECT slug FROM leetcode.problems WHERE slug = ANY(%(slugs)s);
+"""
+
+_SQL_PROBLEMS_BY_SLUGS = """
+SELECT id, title, content, difficulty, topics, companies, hints, slug
+FROM leetcode.problems WHERE slug = ANY(%(slugs)s);
+"""
+
+_SQL_EXISTING_STUDY_PLAN_SLUGS = """
+SELECT slug FROM leetcode.study_plans WHERE slug = ANY(%(slugs)s);
+"""
+
+_SQL_EXISTING_COMPANIES = """
+SELECT name FROM leetcode.companies WHERE name = ANY(%(companies)s);
+"""
+
+_SQL_PROBLEM_COUNT_BY_STUDY_PLAN = """
+SELECT COUNT(DISTINCT spp.problem_id)
+FROM leetcode.study_plan_problems spp
+JOIN leetcode.study_plans sp ON spp.study_plan_id = sp.id
+WHERE sp.slug = %(slug)s;
+"""
+
+_SQL_CATEGORY_COUNT_BY_STUDY_PLAN = """
+SELECT COUNT(DISTINCT spp.category_name)
+FROM leetcode.study_plan_problems spp
+JOIN leetcode.study_plans sp ON spp.study_plan_id = sp.id
+WHERE sp.slug = %(slug)s;
+"""
+
+_SQL_PROBLEMS_BY_COMPANY = """
+SELECT p.id, p.title, p.content, p.difficulty, p.topics, p.companies, p.hints,
+       p.slug
+FROM leetcode.problems p
+WHERE p.companies @> ARRAY[%(company)s]::text[];
+"""
+
+
+def _to_pg_array_literal(values) -> str:
+    """
+    Serialize a list of strings to a Postgres array literal (e.g. '{a,b,c}').
+    :param values: The list of strings to serialize.
+    :return: The Postgres array literal.
+    """
+    escaped = [
+        '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"' for value in values
+    ]
+    return "{" + ",".join(escaped) + "}"
+
+
 def execute_insert(cursor, connection, sql: str, params: Dict[str, Any]) -> Any:
     """
     Execute an insert query and return the ID of the inserted row.
+
+    The transaction is left open; callers commit once per batch via
+    Database.commit() so the WAL fsync cost is paid per batch, not per row.
+
     :param cursor: The cursor to execute the query.
-    :param connection: The connection to commit the transaction.
+    :param connection: The connection to roll back on failure.
     :param sql: The SQL query to execute.
     :param params: The parameters to pass to the query.
     :return: The ID of the inserted row, or None if the operation failed.
@@ -69,51 +329,201 @@ def execute_insert(cursor, connection, sql: str, params: Dict[str, Any]) -> Any:
         cursor.execute(sql, params)
         result = cursor.fetchone()
         if result is not None:
-            result_id = result[0]
-            connection.commit()
-            return result_id
-        else:
-            connection.commit()
-            return None
-    except Exception as e:
+            return result[0]
+        return None
+    except psycopg2.Error as e:
         connection.rollback()
-        print(f"Error executing insert: {e}")
+        logger.warning("insert failed: %s", e)
         return None
 
 
 def execute_query(cursor, connection, sql: str, params: Dict[str, Any]) -> bool:
     """
-    Execute a query and commit the transaction.
+    Execute a query, leaving the transaction open for a batched commit.
     :param cursor: The cursor to execute the query.
-    :param connection: The connection to commit the transaction.
+    :param connection: The connection to roll back on failure.
     :param sql: The SQL query to execute.
     :param params: The parameters to pass to the query.
     :return: True if the operation was successful, False otherwise.
     """
     try:
         cursor.execute(sql, params)
-        connection.commit()
         return True
-    except Exception as e:
+    except psycopg2.Error as e:
         connection.rollback()
-        print(f"Error executing query: {e}")
+        logger.warning("query failed: %s", e)
         return False
 
 
 class Database:
     def __init__(self, connection=None, cursor=None):
+        # Tracks, per thread, whether a transaction() block is open so the
+        # batch-insert methods leave committing to the block.
+        self._tx_state = threading.local()
+
         if connection is None or cursor is None:
-            self.connection = psycopg2.connect(
-                dbname=os.getenv("POSTGRES_DB"),
-                user=os.getenv("POSTGRES_USER"),
-                password=os.getenv("POSTGRES_PASSWORD"),
-                host=os.getenv("POSTGRES_HOST"),
-                port=os.getenv("POSTGRES_PORT"),
-            )
-            self.cursor = self.connection.cursor()
+            # Pooled mode hands every thread its own connection (checked
+            # out lazily), so callers can share one Database across worker
+            # threads without a global lock; psycopg2 cursors are not
+            # thread-safe, connections across threads are.
+            self._connection = None
+            self._cursor = None
+            self._from_pool = True
+            self._local = threading.local()
+            self._checked_out: List[Any] = []
+            self._checked_out_lock = threading.Lock()
         else:
-            self.connection = connection
-            self.cursor = cursor
+            self._connection = connection
+            self._cursor = cursor
+            self._from_pool = False
+
+    @property
+    def connection(self):
+        """
+        The calling thread's connection (pooled mode) or the injected one.
+        """
+        if not self._from_pool:
+            return self._connection
+        return self._thread_state()[0]
+
+    @property
+    def cursor(self):
+        """
+        The calling thread's cursor (pooled mode) or the injected one.
+        """
+        if not self._from_pool:
+            return self._cursor
+        return self._thread_state()[1]
+
+    def ensure_pool_capacity(self, required: int) -> None:
+        """
+        Make sure the shared pool can serve the given number of checkouts.
+
+        Sizes the pool to at least required connections if it has not been
+        created yet; raises if it already exists with fewer, because
+        getconn() fails rather than blocks once the pool runs dry and the
+        resulting PoolErrors surface as silently dropped work.
+
+        :param required: The number of concurrent connection checkouts needed.
+        :raises Exception: If the existing pool is smaller than required.
+        """
+        if not self._from_pool:
+            return
+        pool = _get_pool(maxconn=required)
+        if pool.maxconn < required:
+            raise Exception(
+                f"Connection pool holds {pool.maxconn} connections but "
+                f"{required} are required; raise PG_POOL_MAX"
+            )
+
+    def _thread_state(self):
+        """
+        Check out (once per thread) a prepared connection and cursor.
+
+        :return: The (connection, cursor) pair owned by the calling thread.
+        """
+        state = getattr(self._local, "state", None)
+        if state is None:
+            connection = _get_pool().getconn()
+            cursor = connection.cursor()
+            # Prepared statements are session-level and survive the trip
+            # back to the pool, so a reused connection still holds the
+            # previous Database's PREPAREs; clear them before re-preparing.
+            cursor.execute("DEALLOCATE ALL;")
+            for name, sql in _PREPARED_STATEMENTS.items():
+                cursor.execute(f"PREPARE {name}(text) AS {sql};")
+            state = (connection, cursor)
+            self._local.state = state
+            with self._checked_out_lock:
+                self._checked_out.append(connection)
+        return state
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @contextmanager
+    def named_cursor(self, itersize: int = 2000) -> Iterator:
+        """
+        Yield a short-lived server-side cursor on the shared connection.
+
+        Named cursors stream results in itersize-sized batches instead of
+        materializing the full result set client-side; closing them promptly
+        releases the server-side portal while the connection stays pooled.
+
+        :param itersize: The number of rows fetched per round-trip.
+        """
+        cursor = self.connection.cursor(name=f"db_{uuid4().hex}")
+        cursor.itersize = itersize
+        try:
+            yield cursor
+        finally:
+            cursor.close()
+
+    def commit(self):
+        """
+        Commit the current transaction.
+        """
+        self.connection.commit()
+
+    def rollback(self):
+        """
+        Roll back the current transaction.
+        """
+        self.connection.rollback()
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """
+        Run a block of statements as one transaction on this thread's connection.
+
+        Only covers statements the calling thread issues on its own
+        connection; writes other threads perform (e.g. the db-writer's
+        problem inserts) commit on their own connections regardless. Within
+        the block the batch-insert methods skip their internal commit and
+        re-raise instead of rolling back, so the block's work is committed
+        once on success and rolled back on error, and a failed flow never
+        leaves the pooled connection mid-transaction.
+        """
+        self._tx_state.active = True
+        try:
+            yield
+            self.connection.commit()
+        except Exception:
+            self.connection.rollback()
+            raise
+        finally:
+            self._tx_state.active = False
+
+    @property
+    def _in_transaction(self) -> bool:
+        """
+        Whether the calling thread is inside a transaction() block.
+        """
+        return getattr(self._tx_state, "active", False)
+
+    def _prepare_statements(self):
+        """
+        Prepare the hot lookup statements on the current connection.
+        """
+        self.cursor.execute("DEALLOCATE ALL;")
+        for name, sql in _PREPARED_STATEMENTS.items():
+            self.cursor.execute(f"PREPARE {name}(text) AS {sql};")
+
+    def _execute_prepared(self, name: str, params: tuple):
+        """
+        Execute a prepared statement, re-preparing if the connection was reset.
+        :param name: The name of the prepared statement.
+        :param params: The parameters to pass to the statement.
+        """
+        try:
+            self.cursor.execute(f"EXECUTE {name}(%s)", params)
+        except psycopg2.errors.InvalidSqlStatementName:
+            self.connection.rollback()
+            self._prepare_statements()
+            self.cursor.execute(f"EXECUTE {name}(%s)", params)
 
     def insert_problem(self, problem: Problem) -> Any | None:
         """
@@ -121,33 +531,208 @@ class Database:
         :param problem: The Problem object to insert.
         :return: The ID of the inserted problem.
         """
-        sql = """
-        INSERT INTO leetcode.problems (question_id, title, slug, content, difficulty, topics, companies, hints, link)
-        VALUES (%(id)s, %(title)s, %(slug)s, %(content)s, %(difficulty)s, %(topics)s, %(companies)s, %(hints)s, %(link)s)
-        ON CONFLICT (question_id) DO UPDATE
-        SET title = EXCLUDED.title,
-            slug = EXCLUDED.slug,
-            content = EXCLUDED.content,
-            difficulty = EXCLUDED.difficulty,
-            topics = EXCLUDED.topics,
-            companies = EXCLUDED.companies,
-            hints = EXCLUDED.hints,
-            link = EXCLUDED.link
-        RETURNING id;
-        """
-        return execute_insert(self.cursor, self.connection, sql, problem.to_dict())
+        return execute_insert(
+            self.cursor, self.connection, _SQL_INSERT_PROBLEM, problem.to_dict()
+        )
+
+    def insert_problems(self, problems: List[Problem]) -> List[Any]:
+        """
+        Insert a batch of problems into the database with set-based statements.
+
+        Each column is bound as one typed array and expanded server-side with
+        unnest, so a batch costs one parameter serialization pass per column
+        instead of one per row. The ragged array columns (topics, companies,
+        hints) travel as Postgres array literals cast back to text[] in the
+        SELECT, since a rectangular text[][] cannot represent them.
+
+        :param problems: The list of Problem objects to insert.
+        :return: The IDs of the inserted problems, in insertion order.
+        """
+        if not problems:
+            return []
+
+        batch_size = int(os.getenv("PROBLEM_INSERT_BATCH_SIZE", "500"))
+        ids: List[Any] = []
+
+        try:
+            for start in range(0, len(problems), batch_size):
+                chunk = problems[start : start + batch_size]
+                self.cursor.execute(
+                    _SQL_INSERT_PROBLEMS,
+                    {
+                        "question_ids": [int(problem.id) for problem in chunk],
+                        "titles": [problem.title for problem in chunk],
+                        "slugs": [problem.slug for problem in chunk],
+                        "contents": [problem.content for problem in chunk],
+                        "difficulties": [problem.difficulty for problem in chunk],
+                        "topics": [
+                            _to_pg_array_literal(problem.topics) for problem in chunk
+                        ],
+                        "companies": [
+                            _to_pg_array_literal(problem.companies) for problem in chunk
+                        ],
+                        "hints": [
+                            _to_pg_array_literal(problem.hints) for problem in chunk
+                        ],
+                        "links": [problem.link for problem in chunk],
+                    },
+                )
+                # RETURNING rows are not guaranteed to come back in input
+                # order, so map them by question_id instead of by position
+                id_by_question_id = {
+                    int(result[1]): result[0] for result in self.cursor.fetchall()
+                }
+                ids.extend(id_by_question_id[int(problem.id)] for problem in chunk)
+            if not self._in_transaction:
+                self.connection.commit()
+            return ids
+        except psycopg2.Error as e:
+            if self._in_transaction:
+                raise
+            self.connection.rollback()
+            logger.warning("insert failed: %s", e)
+            return []
+
+    def bulk_copy_problems(self, problems: List[Problem]) -> bool:
+        """
+        Bulk-load problems using COPY into a staging table, then merge.
+
+        COPY bypasses per-row parse/plan/bind entirely, which makes it the
+        fastest ingest path for large initial scrapes. Rows are streamed
+        into a TEMP TABLE mirroring leetcode.problems and merged with a
+        single INSERT ... ON CONFLICT so upsert semantics are preserved.
+
+        :param problems: The list of Problem objects to load.
+        :return: True if the operation was successful, False otherwise.
+        """
+        if not problems:
+            return True
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for problem in problems:
+            writer.writerow(
+                [
+                    problem.id,
+                    problem.title,
+                    problem.slug,
+                    problem.content,
+                    problem.difficulty,
+                    _to_pg_array_literal(problem.topics),
+                    _to_pg_array_literal(problem.companies),
+                    _to_pg_array_literal(problem.hints),
+                    problem.link,
+                ]
+            )
+        buffer.seek(0)
+
+        try:
+            self.cursor.execute(_SQL_CREATE_TMP_PROBLEMS)
+            self.cursor.copy_expert(
+                _SQL_COPY_TMP_PROBLEMS,
+                buffer,
+            )
+            self.cursor.execute(_SQL_MERGE_TMP_PROBLEMS)
+            if not self._in_transaction:
+                self.connection.commit()
+            return True
+        except psycopg2.Error as e:
+            if self._in_transaction:
+                raise
+            self.connection.rollback()
+            logger.warning("bulk copy failed: %s", e)
+            return False
 
     def insert_study_plan(self, study_plan: StudyPlan) -> Any | None:
-        sql = """
-        INSERT INTO leetcode.study_plans (slug, name, description, expected_number_of_problems)
-        VALUES (%(slug)s, %(name)s, %(description)s, %(expected_number_of_problems)s)
-        ON CONFLICT (slug) DO UPDATE
-        SET name = EXCLUDED.name,
-            description = EXCLUDED.description,
-            expected_number_of_problems = EXCLUDED.expected_number_of_problems
-        RETURNING id;
+        return execute_insert(
+            self.cursor, self.connection, _SQL_INSERT_STUDY_PLAN, study_plan.to_dict()
+        )
+
+    def insert_study_plan_with_problems(
+        self, study_plan: StudyPlan, problems_with_categories: List[Tuple[Problem, str]]
+    ) -> Any | None:
+        """
+        Upsert a study plan, its problems, and the join rows in one statement.
+
+        Chained writable CTEs perform all three upserts inside a single
+        transaction and network round-trip, replacing the O(N) sequence of
+        small statements the incremental flow would otherwise issue. Intended
+        for bulk ingest where all problems are already in hand.
+
+        :param study_plan: The StudyPlan object to insert.
+        :param problems_with_categories: A list of (Problem, category_name) tuples.
+        :return: The ID of the study plan, or None if the operation failed.
         """
-        return execute_insert(self.cursor, self.connection, sql, study_plan.to_dict())
+        problems = [problem for problem, _ in problems_with_categories]
+
+        params = study_plan.to_dict()
+        params.update(
+            {
+                "question_ids": [int(problem.id) for problem in problems],
+                "titles": [problem.title for problem in problems],
+                "slugs": [problem.slug for problem in problems],
+                "contents": [problem.content for problem in problems],
+                "difficulties": [problem.difficulty for problem in problems],
+                "topics": [
+                    _to_pg_array_literal(problem.topics) for problem in problems
+                ],
+                "companies": [
+                    _to_pg_array_literal(problem.companies) for problem in problems
+                ],
+                "hints": [_to_pg_array_literal(problem.hints) for problem in problems],
+                "links": [problem.link for problem in problems],
+                "category_question_ids": [
+                    int(problem.id) for problem, _ in problems_with_categories
+                ],
+                "category_names": [
+                    category for _, category in problems_with_categories
+                ],
+            }
+        )
+
+        try:
+            self.cursor.execute(_SQL_INSERT_STUDY_PLAN_BUNDLE, params)
+            result = self.cursor.fetchone()
+            if not self._in_transaction:
+                self.connection.commit()
+            return result[0] if result is not None else None
+        except psycopg2.Error as e:
+            if self._in_transaction:
+                raise
+            self.connection.rollback()
+            logger.warning("insert failed: %s", e)
+            return None
+
+    def insert_study_plan_problems(self, rows: List[Tuple[int, int, str]]) -> bool:
+        """
+        Insert a batch of problems into study plans with a single statement.
+
+        Uses execute_values so N rows cost one parse/plan and one network
+        round-trip instead of N.
+
+        :param rows: A list of (study_plan_id, problem_id, category_name) tuples.
+        :return: True if the operation was successful, False otherwise.
+        """
+        if not rows:
+            return True
+
+        try:
+            execute_values(
+                self.cursor,
+                _SQL_INSERT_STUDY_PLAN_PROBLEMS,
+                rows,
+                template="(%s,%s,%s)",
+                page_size=1000,
+            )
+            if not self._in_transaction:
+                self.connection.commit()
+            return True
+        except psycopg2.Error as e:
+            if self._in_transaction:
+                raise
+            self.connection.rollback()
+            logger.warning("insert failed: %s", e)
+            return False
 
     def insert_study_plan_problem(
         self, study_plan_id: int, problem_id: int, category_name: str
@@ -159,21 +744,8 @@ class Database:
         :param category_name: The category of the problem.
         :return: True if the operation was successful, False otherwise.
         """
-        sql = """
-        INSERT INTO leetcode.study_plan_problems (study_plan_id, problem_id, category_name)
-        VALUES (%(study_plan_id)s, %(problem_id)s, %(category_name)s)
-        ON CONFLICT (study_plan_id, problem_id) DO UPDATE
-        SET category_name = EXCLUDED.category_name;
-        """
-        return execute_query(
-            self.cursor,
-            self.connection,
-            sql,
-            {
-                "study_plan_id": study_plan_id,
-                "problem_id": problem_id,
-                "category_name": category_name,
-            },
+        return self.insert_study_plan_problems(
+            [(study_plan_id, problem_id, category_name)]
         )
 
     def get_problem_by_slug(self, slug: str) -> Problem | None:
@@ -182,12 +754,7 @@ class Database:
         :param slug: The slug of the problem.
         :return: The Problem object with the given slug, or None if not found.
         """
-        sql = """
-        SELECT id, title, content, difficulty, topics, companies, hints
-        FROM leetcode.problems
-        WHERE slug = %(slug)s;
-        """
-        self.cursor.execute(sql, {"slug": slug})
+        self._execute_prepared("problem_by_slug", (slug,))
         result = self.cursor.fetchone()
 
         if result is None:
@@ -203,16 +770,7 @@ class Database:
         :param slug: The slug of the study plan.
         :return: The StudyPlan object with the given slug, or None if not found.
         """
-        sql = """
-        SELECT sp.slug, sp.name, sp.description, sp.expected_number_of_problems,
-               COUNT(DISTINCT spp.problem_id) AS number_of_problems,
-               COUNT(DISTINCT spp.category_name) AS number_of_categories
-        FROM leetcode.study_plans sp
-        LEFT JOIN leetcode.study_plan_problems spp ON sp.id = spp.study_plan_id
-        WHERE sp.slug = %(slug)s
-        GROUP BY sp.slug, sp.name, sp.description, sp.expected_number_of_problems;
-        """
-        self.cursor.execute(sql, {"slug": slug})
+        self.cursor.execute(_SQL_STUDY_PLAN_BY_SLUG, {"slug": slug})
         result = self.cursor.fetchone()
 
         if result is None:
@@ -220,29 +778,89 @@ class Database:
 
         return _create_study_plan_from_result(result)
 
-    def get_problems_by_study_plan_slug(self, slug: str) -> list[Problem]:
+    def get_problems_by_study_plan_slug(self, slug: str) -> Iterator[Problem]:
         """
-        Get a list of problems for a study plan.
+        Get the problems for a study plan, streamed from a server-side cursor.
+
+        Rows arrive in chunks of itersize instead of being materialized all
+        at once, keeping peak memory flat for large plans.
+
         :param slug: The slug of the study plan.
-        :return: A list of Problem objects.
-        """
-        sql = """
-        SELECT p.id, p.title, p.content, p.difficulty, p.topics, p.companies, p.hints
-        FROM leetcode.problems p
-        JOIN leetcode.study_plan_problems spp ON p.id = spp.problem_id
-        JOIN leetcode.study_plans sp ON spp.study_plan_id = sp.id
-        WHERE sp.slug = %(slug)s;
+        :return: An iterator of Problem objects.
+        """
+        # content is ~KBs of HTML per row; a larger itersize batches
+        # libpq reads into fewer recv syscalls for these wide rows
+        with self.named_cursor(itersize=4000) as cursor:
+            cursor.execute(_SQL_PROBLEMS_BY_STUDY_PLAN, {"slug": slug})
+            for result in cursor:
+                yield _MAKE_PROBLEM(
+                    int(result[0]),
+                    result[1],
+                    result[2],
+                    result[3],
+                    result[4] or [],
+                    result[5] or [],
+                    result[6] or [],
+                    result[7],
+                )
+
+    def existing_problem_slugs(self, slugs: Iterable[str]) -> Set[str]:
+        """
+        Get the subset of the given slugs that already exist as problems.
+
+        One round-trip regardless of how many slugs are probed; callers do
+        set-difference locally instead of issuing one EXISTS query per slug.
+
+        :param slugs: The slugs to probe.
+        :return: The set of slugs present in the database.
+        """
+        self.cursor.execute(_SQL_EXISTING_PROBLEM_SLUGS, {"slugs": list(slugs)})
+        return {result[0] for result in self.cursor.fetchall()}
+
+    def get_problems_by_slugs(self, slugs: Iterable[str]) -> Dict[str, Problem]:
+        """
+        Get every stored problem whose slug is in the given set, in one query.
+
+        Replaces a membership probe plus one SELECT per known slug when
+        hydrating a batch, cutting N+1 round-trips to 1.
+
+        :param slugs: The slugs to look up.
+        :return: A dictionary mapping each found slug to its Problem object.
+        """
+        self.cursor.execute(_SQL_PROBLEMS_BY_SLUGS, {"slugs": list(slugs)})
+        return {
+            result[7]: _MAKE_PROBLEM(
+                int(result[0]),
+                result[1],
+                result[2],
+                result[3],
+                result[4] or [],
+                result[5] or [],
+                result[6] or [],
+                result[7],
+            )
+            for result in self.cursor.fetchall()
+        }
+
+    def existing_study_plan_slugs(self, slugs: Iterable[str]) -> Set[str]:
         """
-        self.cursor.execute(sql, {"slug": slug})
-        results = self.cursor.fetchall()
+        Get the subset of the given slugs that already exist as study plans.
 
-        problems = []
-        for result in results:
-            problem = _create_problem_from_result(result)
+        :param slugs: The slugs to probe.
+        :return: The set of slugs present in the database.
+        """
+        self.cursor.execute(_SQL_EXISTING_STUDY_PLAN_SLUGS, {"slugs": list(slugs)})
+        return {result[0] for result in self.cursor.fetchall()}
 
-            problems.append(problem)
+    def existing_companies(self, companies: Iterable[str]) -> Set[str]:
+        """
+        Get the subset of the given company names that already exist.
 
-        return problems
+        :param companies: The company names to probe.
+        :return: The set of company names present in the database.
+        """
+        self.cursor.execute(_SQL_EXISTING_COMPANIES, {"companies": list(companies)})
+        return {result[0] for result in self.cursor.fetchall()}
 
     def does_problem_exist(self, slug: str) -> bool:
         """
@@ -250,16 +868,10 @@ class Database:
         :param slug: The slug of the problem.
         :return: True if the problem exists, False otherwise.
         """
-        sql = """
-        SELECT EXISTS(SELECT 1 FROM leetcode.problems WHERE slug = %(slug)s);
-        """
-        self.cursor.execute(sql, {"slug": slug})
+        self._execute_prepared("problem_exists", (slug,))
 
-        try:
-            result = self.cursor.fetchone()
-            return result[0]
-        except Exception:
-            return False
+        result = self.cursor.fetchone()
+        return result[0]
 
     def does_study_plan_exist(self, slug: str) -> bool:
         """
@@ -267,16 +879,10 @@ class Database:
         :param slug: The slug of the study plan.
         :return: True if the study plan exists, False otherwise.
         """
-        sql = """
-        SELECT EXISTS(SELECT 1 FROM leetcode.study_plans WHERE slug = %(slug)s);
-        """
-        self.cursor.execute(sql, {"slug": slug})
+        self._execute_prepared("study_plan_exists", (slug,))
 
-        try:
-            result = self.cursor.fetchone()
-            return result[0]
-        except Exception:
-            return False
+        result = self.cursor.fetchone()
+        return result[0]
 
     def does_company_exist(self, company: str) -> bool:
         """
@@ -284,16 +890,10 @@ class Database:
         :param company: The name of the company.
         :return: True if the company exists, False otherwise.
         """
-        sql = """
-        SELECT EXISTS(SELECT 1 FROM leetcode.companies WHERE name = %(company)s);
-        """
-        self.cursor.execute(sql, {"company": company})
+        self._execute_prepared("company_exists", (company,))
 
-        try:
-            result = self.cursor.fetchone()
-            return result[0]
-        except Exception:
-            return False
+        result = self.cursor.fetchone()
+        return result[0]
 
     def get_problem_count_by_study_plan(self, slug: str) -> int:
         """
@@ -301,13 +901,7 @@ class Database:
         :param slug: The slug of the study plan.
         :return: The number of problems in the study plan.
         """
-        sql = """
-        SELECT COUNT(DISTINCT spp.problem_id)
-        FROM leetcode.study_plan_problems spp
-        JOIN leetcode.study_plans sp ON spp.study_plan_id = sp.id
-        WHERE sp.slug = %(slug)s;
-        """
-        self.cursor.execute(sql, {"slug": slug})
+        self.cursor.execute(_SQL_PROBLEM_COUNT_BY_STUDY_PLAN, {"slug": slug})
         result = self.cursor.fetchone()
 
         if result is None:
@@ -321,13 +915,7 @@ class Database:
         :param slug: The slug of the study plan.
         :return: The number of categories in the study plan.
         """
-        sql = """
-        SELECT COUNT(DISTINCT spp.category_name)
-        FROM leetcode.study_plan_problems spp
-        JOIN leetcode.study_plans sp ON spp.study_plan_id = sp.id
-        WHERE sp.slug = %(slug)s;
-        """
-        self.cursor.execute(sql, {"slug": slug})
+        self.cursor.execute(_SQL_CATEGORY_COUNT_BY_STUDY_PLAN, {"slug": slug})
         result = self.cursor.fetchone()
 
         if result is None:
@@ -335,25 +923,35 @@ class Database:
 
         return result[0]
 
-    def get_problems_by_company(self, company: str) -> list[Problem]:
-        """
-        Get a list of problems by a specific company.
-        :param company: The name of the company.
-        :return: A list of Problem objects.
+    def get_problems_by_company(self, company: str) -> Iterator[Problem]:
         """
-        sql = """
-        SELECT p.id, p.question_id, p.title, p.slug, p.content, p.difficulty, p.topics, p.companies, p.hints, p.link
-        FROM leetcode.problems p
-        WHERE %(company)s = ANY(p.companies);
-        """
-        self.cursor.execute(sql, {"company": company})
-        results = self.cursor.fetchall()
-
-        if results is None:
-            return []
+        Get the problems for a company, streamed from a server-side cursor.
 
-        return [_create_problem_from_result(result) for result in results]
+        :param company: The name of the company.
+        :return: An iterator of Problem objects.
+        """
+        with self.named_cursor(itersize=4000) as cursor:
+            cursor.execute(_SQL_PROBLEMS_BY_COMPANY, {"company": company})
+            for result in cursor:
+                yield _MAKE_PROBLEM(
+                    int(result[0]),
+                    result[1],
+                    result[2],
+                    result[3],
+                    result[4] or [],
+                    result[5] or [],
+                    result[6] or [],
+                    result[7],
+                )
 
     def close(self):
-        self.cursor.close()
-        self.connection.close()
+        if self._from_pool:
+            pool = _get_pool()
+            with self._checked_out_lock:
+                connections = list(self._checked_out)
+                self._checked_out.clear()
+            for connection in connections:
+                pool.putconn(connection)
+        else:
+            self._cursor.close()
+            self._connection.close()
@@ -0,0 +1,4 @@
+-- GIN index so company lookups on the companies text[] column use an index
+-- scan (companies @> ARRAY[...]) instead of a sequential scan per call.
+CREATE INDEX IF NOT EXISTS problems_companies_gin
+    ON leetcode.problems USING GIN (companies);
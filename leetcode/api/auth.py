@@ -1,13 +1,45 @@
+import time
+from typing import Dict, Tuple
+
 import requests
 
+# Reuse one session so the TCP + TLS connection to leetcode.com stays warm
+# across token fetches.
+_SESSION = requests.Session()
+
+# Cache of session_id -> (token, fetched_at). LeetCode's csrftoken is valid
+# for a year, so a conservative TTL still removes virtually every refetch.
+_CSRF_CACHE: Dict[str, Tuple[str, float]] = {}
+_CSRF_TTL_SECONDS = 6 * 60 * 60
+
 
 # Experimental: CSRF token can be obtained automatically.
 def get_csrf_cookie(session_id: str) -> str:
-    response = requests.get(
-        "https://leetcode.com/", cookies={"LEETCODE_SESSION": session_id}
+    cached = _CSRF_CACHE.get(session_id)
+    if cached is not None:
+        token, fetched_at = cached
+        if time.monotonic() - fetched_at < _CSRF_TTL_SECONDS:
+            return token
+
+    response = _SESSION.get(
+        "https://leetcode.com/",
+        cookies={"LEETCODE_SESSION": session_id},
+        timeout=10,
     )
 
     if "csrftoken" not in response.cookies:
         raise Exception("CSRF token not found in cookies")
 
-    return response.cookies["csrftoken"]
+    token = response.cookies["csrftoken"]
+    _CSRF_CACHE[session_id] = (token, time.monotonic())
+
+    return token
+
+
+def invalidate_csrf_cache(session_id: str):
+    """
+    Drop the cached CSRF token for a session, forcing a refetch on next use.
+
+    :param session_id: The LEETCODE_SESSION cookie whose token should expire.
+    """
+    _CSRF_CACHE.pop(session_id, None)
@@ -1,10 +1,119 @@
-from typing import Dict, Any, List
+import hashlib
+import threading
+from functools import lru_cache
+from typing import Dict, Any, List, Set
 
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from leetcode.api.configuration import Configuration
 from leetcode.api.auth import get_csrf_cookie
 
+# Connect/read timeout applied to every GraphQL call so a stalled request
+# never blocks a worker thread indefinitely.
+_TIMEOUT = (3.05, 30)
+
+_API_URL = "https://leetcode.com/graphql"
+
+
+def _is_persisted_query_miss(errors) -> bool:
+    """
+    Check whether GraphQL errors signal an unregistered persisted query.
+
+    Servers spell the miss differently (PERSISTED_QUERY_NOT_FOUND,
+    PersistedQueryNotFound), so the comparison is case- and
+    underscore-insensitive. Anything else (including
+    PersistedQueryNotSupported) is not a miss.
+
+    :param errors: The errors list from a GraphQL response, if any.
+    :return: True if any error is a persisted-query-not-found miss.
+    """
+    if not errors:
+        return False
+    return any(
+        str(error.get("message", "")).replace("_", "").lower()
+        == "persistedquerynotfound"
+        for error in errors
+    )
+
+
+@lru_cache(maxsize=None)
+def _query_sha256(query: str) -> str:
+    """
+    Compute (and memoize) the persisted-query hash for a GraphQL document.
+
+    :param query: The GraphQL query text.
+    :return: The hex-encoded sha256 of the query.
+    """
+    return hashlib.sha256(query.encode()).hexdigest()
+
+
+# GraphQL documents are interned once at import so every call (and its
+# persisted-query hash) reuses the same object.
+_Q_PROBLEM_DETAILS = """
+query getQuestionDetail($titleSlug: String!) {
+    question(titleSlug: $titleSlug) {
+        questionId
+        title
+        content
+        difficulty
+        topicTags {
+            name
+        }
+        companyTags {
+            name
+        }
+        hints
+    }
+}
+"""
+
+_Q_STUDY_PLAN = """
+query studyPlanDetail($slug: String!) {
+    studyPlanV2Detail(planSlug: $slug) {
+        slug
+        name
+        description
+        planSubGroups {
+            name
+            questionNum
+            questions {
+                titleSlug
+            }
+        }
+    }
+}
+"""
+
+_Q_COMPANY_QUESTIONS = """
+query favoriteQuestionListForCompany($favoriteSlug: String!, $filter: FavoriteQuestionFilterInput) {
+  favoriteQuestionList(favoriteSlug: $favoriteSlug, filter: $filter) {
+    questions {
+      titleSlug
+    }
+  }
+}
+"""
+
+# Shared selection set for single and aliased batch problem queries.
+_QUESTION_FIELDS_FRAGMENT = """
+fragment QuestionFields on QuestionNode {
+    questionId
+    title
+    content
+    difficulty
+    topicTags {
+        name
+    }
+    companyTags {
+        name
+    }
+    hints
+}
+"""
+
 
 class Client:
     def __init__(self, configuration: Configuration):
@@ -14,28 +123,136 @@ class Client:
         :param configuration: A configuration object containing LeetCode session and CSRF token.
         """
         self.configuration = configuration
-        leetcode_session = configuration.get("leetcode_session")
-        csrf_token = configuration.get("csrf_token")
+        leetcode_session = configuration.leetcode_session
+        csrf_token = configuration.csrf_token
 
         if leetcode_session and not csrf_token:
             csrf_token = get_csrf_cookie(leetcode_session)
-            configuration.set("csrf_token", csrf_token)
+            configuration.csrf_token = csrf_token
 
         self.leetcode_session = leetcode_session
         self.csrf_token = csrf_token
 
+        # Headers are immutable after construction, so the dict and its
+        # Cookie string are built exactly once.
+        self._headers = {
+            "Content-Type": "application/json",
+            "User-Agent": "Mozilla/5.0",
+            "x-csrftoken": self.csrf_token,
+            "Cookie": f"LEETCODE_SESSION={self.leetcode_session}; csrftoken={self.csrf_token}",
+        }
+
+        # A single keep-alive session amortizes the TCP + TLS handshake
+        # across the hundreds of small GraphQL POSTs a scrape issues. The
+        # adapter is sized for heavily threaded fetching, and retries run
+        # inside the HTTP layer with jittered exponential backoff so
+        # parallel workers do not thunder on the same retry schedule.
+        # requests/urllib3 cannot multiplex over HTTP/2; equivalent
+        # parallelism comes from the pooled connections plus the aliased
+        # batch queries, which keep the request count per problem low.
+        retry = Retry(
+            total=5,
+            backoff_factor=0.5,
+            backoff_jitter=0.3,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset({"POST"}),
+            respect_retry_after_header=True,
+        )
+        self._session = requests.Session()
+        self._session.mount(
+            "https://",
+            HTTPAdapter(pool_connections=32, pool_maxsize=64, max_retries=retry),
+        )
+        self._session.headers.update(self._headers)
+
+        # Memoized response payloads keyed by operation and variables, so
+        # duplicate calls within a run skip HTTP and JSON parsing entirely.
+        self._response_cache: Dict[str, Any] = {}
+        self._response_cache_lock = threading.Lock()
+
+        # Hashes the server is known to have registered; once a hash is in
+        # here, requests carry ~150 B of extensions instead of the full
+        # query text. Races only cost a redundant full-query send.
+        self._registered_query_hashes: Set[str] = set()
+
+        # Flipped off permanently if a hash-only request fails with anything
+        # other than a not-found miss (e.g. PersistedQueryNotSupported or a
+        # plain 400), so a server without APQ costs one wasted round-trip
+        # total instead of one per call.
+        self._apq_enabled = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Close the underlying HTTP session and its pooled connections.
+        """
+        self._session.close()
+
+    def _post_graphql(self, query: str, variables: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        POST a GraphQL operation, using Automatic Persisted Queries.
+
+        Once the server has accepted a query, follow-up requests send only
+        its sha256 hash. Any failure of a hash-only request - an evicted
+        hash, however the server spells its not-found error, an APQ-less
+        server answering with PersistedQueryNotSupported, or a flat HTTP
+        400 - falls back to re-sending the full query; non-miss failures
+        additionally disable APQ for the rest of the session.
+
+        :param query: The GraphQL query text.
+        :param variables: The variables for the operation.
+        :return: The decoded response payload.
+        """
+        query_hash = _query_sha256(query)
+        extensions = {"persistedQuery": {"version": 1, "sha256Hash": query_hash}}
+
+        if self._apq_enabled and query_hash in self._registered_query_hashes:
+            payload = {"variables": variables, "extensions": extensions}
+            response = self._session.post(
+                _API_URL, data=orjson.dumps(payload), timeout=_TIMEOUT
+            )
+
+            errors = None
+            if response.status_code != 400:
+                response.raise_for_status()  # Raise an exception for HTTP errors
+                response_data = orjson.loads(response.content)
+                errors = response_data.get("errors")
+                if not errors:
+                    return response_data
+
+            # The hash-only request failed; fall through to the full query
+            self._registered_query_hashes.discard(query_hash)
+            if not _is_persisted_query_miss(errors):
+                self._apq_enabled = False
+
+        payload = {"query": query, "variables": variables}
+        if self._apq_enabled:
+            payload["extensions"] = extensions
+
+        response = self._session.post(
+            _API_URL, data=orjson.dumps(payload), timeout=_TIMEOUT
+        )
+        response.raise_for_status()  # Raise an exception for HTTP errors
+        response_data = orjson.loads(response.content)
+
+        # Only a clean response proves the server registered the hash
+        if self._apq_enabled and not response_data.get("errors"):
+            self._registered_query_hashes.add(query_hash)
+
+        return response_data
+
     def _get_headers(self) -> Dict[str, str]:
         """
         Returns the headers required for making a request to LeetCode's GraphQL API.
 
         :return: A dictionary containing the headers.
         """
-        return {
-            "Content-Type": "application/json",
-            "User-Agent": "Mozilla/5.0",
-            "x-csrftoken": self.csrf_token,
-            "Cookie": f"LEETCODE_SESSION={self.leetcode_session}; csrftoken={self.csrf_token}",
-        }
+        return self._headers
 
     def get_problem_details(self, slug: str) -> Dict[str, Any]:
         """
@@ -45,33 +262,14 @@ class Client:
         :return: A dictionary containing the problem details.
         :raises Exception: If the API request fails or the response does not contain expected data.
         """
-        api_url = "https://leetcode.com/graphql"
-        query = """
-        query getQuestionDetail($titleSlug: String!) {
-            question(titleSlug: $titleSlug) {
-                questionId
-                title
-                content
-                difficulty
-                topicTags {
-                    name
-                }
-                companyTags {
-                    name
-                }
-                hints
-            }
-        }
-        """
-        variables = {"titleSlug": slug}
-        headers = self._get_headers()
+        cache_key = f"problem:{slug}"
+        with self._response_cache_lock:
+            if cache_key in self._response_cache:
+                return self._response_cache[cache_key]
 
-        response = requests.post(
-            api_url, json={"query": query, "variables": variables}, headers=headers
-        )
-        response.raise_for_status()  # Raise an exception for HTTP errors
+        variables = {"titleSlug": slug}
 
-        response_data = response.json()
+        response_data = self._post_graphql(_Q_PROBLEM_DETAILS, variables)
         if "data" not in response_data or "question" not in response_data["data"]:
             raise Exception("Problem not found or invalid response format")
 
@@ -80,7 +278,52 @@ class Client:
             "link"
         ] = f"https://leetcode.com/problems/{slug}/"
 
-        return response_data["data"]["question"]
+        question = response_data["data"]["question"]
+        with self._response_cache_lock:
+            self._response_cache[cache_key] = question
+
+        return question
+
+    def get_problems_details_batch(
+        self, slugs: List[str], batch_size: int = 20
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch details for several problems with aliased GraphQL queries.
+
+        Each POST bundles up to batch_size aliased question fields, so N
+        problems cost ceil(N / batch_size) round-trips instead of N.
+
+        :param slugs: The slugs of the problems to fetch.
+        :param batch_size: The maximum number of problems per request.
+        :return: A dictionary mapping each found slug to its problem details.
+        :raises Exception: If the API request fails or the response does not contain expected data.
+        """
+        details: Dict[str, Dict[str, Any]] = {}
+
+        for start in range(0, len(slugs), batch_size):
+            chunk = slugs[start : start + batch_size]
+            params = ", ".join(f"$s{i}: String!" for i in range(len(chunk)))
+            fields = " ".join(
+                f"q{i}: question(titleSlug: $s{i}) {{ ...QuestionFields }}"
+                for i in range(len(chunk))
+            )
+            query = (
+                f"query questionBatch({params}) {{ {fields} }}"
+                f"{_QUESTION_FIELDS_FRAGMENT}"
+            )
+            variables = {f"s{i}": slug for i, slug in enumerate(chunk)}
+
+            response_data = self._post_graphql(query, variables)
+            if "data" not in response_data or response_data["data"] is None:
+                raise Exception("Problems not found or invalid response format")
+
+            for i, slug in enumerate(chunk):
+                question = response_data["data"].get(f"q{i}")
+                if question is not None:
+                    question["link"] = f"https://leetcode.com/problems/{slug}/"
+                    details[slug] = question
+
+        return details
 
     def get_study_plan_details(self, plan_slug: str) -> Dict[str, Any]:
         """
@@ -90,72 +333,14 @@ class Client:
         :return: A dictionary containing the study plan details and the total number of problems.
         :raises Exception: If the API request fails or the response does not contain expected data.
         """
-        api_url = "https://leetcode.com/graphql"
-        query = """
-        query studyPlanDetail($slug: String!) {
-            studyPlanV2Detail(planSlug: $slug) {
-                slug
-                name
-                highlight
-                staticCoverPicture
-                colorPalette
-                threeDimensionUrl
-                description
-                premiumOnly
-                needShowTags
-                awardDescription
-                defaultLanguage
-                award {
-                    name
-                    config {
-                        icon
-                        iconGif
-                        iconGifBackground
-                    }
-                }
-                relatedStudyPlans {
-                    cover
-                    highlight
-                    name
-                    slug
-                    premiumOnly
-                }
-                planSubGroups {
-                    slug
-                    name
-                    premiumOnly
-                    questionNum
-                    questions {
-                        translatedTitle
-                        titleSlug
-                        title
-                        questionFrontendId
-                        paidOnly
-                        id
-                        difficulty
-                        hasOfficialSolution
-                        topicTags {
-                            slug
-                            name
-                        }
-                        solutionInfo {
-                            solutionSlug
-                            solutionTopicId
-                        }
-                    }
-                }
-            }
-        }
-        """
-        variables = {"slug": plan_slug}
-        headers = self._get_headers()
+        cache_key = f"study_plan:{plan_slug}"
+        with self._response_cache_lock:
+            if cache_key in self._response_cache:
+                return self._response_cache[cache_key]
 
-        response = requests.post(
-            api_url, json={"query": query, "variables": variables}, headers=headers
-        )
-        response.raise_for_status()  # Raise an exception for HTTP errors
+        variables = {"slug": plan_slug}
 
-        response_data = response.json()
+        response_data = self._post_graphql(_Q_STUDY_PLAN, variables)
         if (
             "data" not in response_data
             or "studyPlanV2Detail" not in response_data["data"]
@@ -172,6 +357,9 @@ class Client:
         # Add the total number of problems to the study plan details
         study_plan_details["totalProblems"] = total_problems
 
+        with self._response_cache_lock:
+            self._response_cache[cache_key] = study_plan_details
+
         return study_plan_details
 
     def get_recent_questions_for_company(
@@ -195,43 +383,20 @@ class Client:
         if difficulties is None:
             difficulties = ["EASY", "MEDIUM"]
 
-        api_url = "https://leetcode.com/graphql"
+        cache_key = (
+            f"company:{company_slug}:{timeframe}:{','.join(difficulties)}:{top_n}"
+        )
+        with self._response_cache_lock:
+            if cache_key in self._response_cache:
+                return self._response_cache[cache_key]
+
         favorite_slug = f"{company_slug}-{timeframe}"
-        query = """
-        query favoriteQuestionListForCompany($favoriteSlug: String!, $filter: FavoriteQuestionFilterInput) {
-          favoriteQuestionList(favoriteSlug: $favoriteSlug, filter: $filter) {
-            questions {
-              difficulty
-              id
-              paidOnly
-              questionFrontendId
-              status
-              title
-              titleSlug
-              translatedTitle
-              isInMyFavorites
-              frequency
-              topicTags {
-                name
-                nameTranslated
-                slug
-              }
-            }
-          }
-        }
-        """
         variables = {
             "favoriteSlug": favorite_slug,
             "filter": {"difficultyList": difficulties, "positionRoleTagSlug": ""},
         }
-        headers = self._get_headers()
 
-        response = requests.post(
-            api_url, json={"query": query, "variables": variables}, headers=headers
-        )
-        response.raise_for_status()  # Raise an exception for HTTP errors
-
-        response_data = response.json()
+        response_data = self._post_graphql(_Q_COMPANY_QUESTIONS, variables)
 
         if (
             "data" not in response_data
@@ -245,4 +410,8 @@ class Client:
             raise Exception("Questions not found or invalid response format")
 
         # Limit to top N questions
-        return response_data["data"]["favoriteQuestionList"]["questions"][:top_n]
+        questions = response_data["data"]["favoriteQuestionList"]["questions"][:top_n]
+        with self._response_cache_lock:
+            self._response_cache[cache_key] = questions
+
+        return questions
@@ -1,24 +1,15 @@
-from typing import Dict
-
-
 class Configuration:
-    def __init__(self):
-        self.auth: Dict[str, str] = {}
-
-    def get(self, key: str) -> str:
-        """
-        Get the value of the configuration key.
-
-        :param key: The key to get the value for.
-        :return: The value of the key.
-        """
-        return self.auth.get(key, "")
+    # Two fixed credential fields read on every authenticated request, so
+    # they live in slots and are accessed as plain attributes instead of
+    # going through dict-backed get/set wrappers.
+    __slots__ = ("leetcode_session", "csrf_token")
 
-    def set(self, key: str, value: str):
+    def __init__(self, leetcode_session: str = "", csrf_token: str = ""):
         """
-        Set the value of the configuration key.
+        Initialize the configuration with the LeetCode credentials.
 
-        :param key: The key to set the value for.
-        :param value: The value to set.
+        :param leetcode_session: The LEETCODE_SESSION cookie value.
+        :param csrf_token: The CSRF token for authenticated requests.
         """
-        self.auth[key] = value
+        self.leetcode_session = leetcode_session
+        self.csrf_token = csrf_token
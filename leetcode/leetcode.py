@@ -1,11 +1,12 @@
-import multiprocessing
-import re
+import logging
+import queue
 import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from operator import itemgetter
 from typing import Dict, List
 
-from requests import HTTPError, RequestException
+from requests import RequestException
 
 from leetcode.api.client import Client
 from leetcode.problem import Problem
@@ -13,31 +14,63 @@ from leetcode.study_plan import StudyPlan
 
 from database.database import Database
 
+log = logging.getLogger(__name__)
 
-def _fetch_with_retries(fetch_func, max_retries=5, delay=2, backoff=2):
+# Problem fetches are pure network I/O, so concurrency is bounded by the
+# Client session's connection pool rather than the CPU count.
+DEFAULT_IO_CONCURRENCY = 32
+
+# Problems per aliased GraphQL request; each worker fetches a batch, not a
+# single slug, so a plan costs ceil(N / batch) round-trips.
+PROBLEM_FETCH_BATCH_SIZE = 20
+
+# The database writer flushes when this many problems are queued or when
+# the oldest queued problem has waited this long, whichever comes first.
+DB_WRITE_BATCH_SIZE = 32
+DB_WRITE_INTERVAL_SECONDS = 0.1
+
+
+def _fetch_with_retries(fetch_func):
     """
-    Fetch data with retries in case of rate limiting.
+    Invoke a fetch callable, surfacing failures that survived the retries.
+
+    Retries (including 429 and transient 5xx) now run inside the HTTP
+    adapter with jittered exponential backoff, so workers are not parked
+    in time.sleep while holding executor slots; this wrapper only remains
+    as the seam where exhausted retries are reported.
 
     :param fetch_func: The function to fetch data.
-    :param max_retries: The maximum number of retries.
-    :param delay: The initial delay between retries.
-    :param backoff: The backoff multiplier for the delay.
     :return: The fetched data.
     """
-    retries = 0
-    while retries < max_retries:
-        try:
-            return fetch_func()
-        except HTTPError as e:
-            if e.response.status_code == 429:
-                time.sleep(delay)
-                delay *= backoff
-                retries += 1
-            else:
-                raise
-        except RequestException:
-            raise
-    raise Exception("Max retries exceeded")
+    try:
+        return fetch_func()
+    except RequestException as e:
+        log.warning("Request failed after retries: %s", e)
+        raise
+
+
+# Extracts tag names in C instead of a per-tag subscript in bytecode.
+_TAG_NAME = itemgetter("name")
+
+
+def _build_problem(question: dict, slug: str = "") -> Problem:
+    """
+    Build a Problem object from raw GraphQL question details.
+
+    :param question: The question details returned by the API.
+    :param slug: The canonical slug the question was fetched under.
+    :return: The constructed Problem object.
+    """
+    return Problem(
+        id=question["questionId"],
+        title=question["title"],
+        content=question["content"],
+        difficulty=question["difficulty"],
+        topics=list(map(_TAG_NAME, question.get("topicTags") or ())),
+        companies=list(map(_TAG_NAME, question.get("companyTags") or ())),
+        hints=question.get("hints") or [],
+        slug=slug,
+    )
 
 
 def convert_time_frame_to_str(timeframe: str, format_type: str = "default") -> str:
@@ -65,10 +98,21 @@ def convert_time_frame_to_str(timeframe: str, format_type: str = "default") -> s
 
 
 class LeetCode:
-    def __init__(self, client: Client, database: Database = None):
+    def __init__(
+        self,
+        client: Client,
+        database: Database = None,
+        io_concurrency: int = DEFAULT_IO_CONCURRENCY,
+    ):
         self.client = client
         self.database = database
 
+        # Every worker plus the db-writer and main threads holds its own
+        # pooled connection, so the pool must be sized for this instance's
+        # concurrency - not just the default - before any worker starts.
+        if database is not None:
+            database.ensure_pool_capacity(io_concurrency + 2)
+
         self.problems: Dict[str, Problem] = {}
         self.study_plans: Dict[str, StudyPlan] = {}
         self.companies: Dict[str, List[Problem]] = {}
@@ -76,7 +120,106 @@ class LeetCode:
         self.problems_lock = threading.Lock()
         self.study_plans_lock = threading.Lock()
         self.companies_lock = threading.Lock()
-        self.database_lock = threading.Lock()
+
+        # Per-key locks so two workers fetching different slugs (or
+        # companies) never contend, while duplicate fetches of the same
+        # key still serialize. The guard only covers lock creation.
+        self._slug_locks: Dict[str, threading.Lock] = {}
+        self._company_locks: Dict[str, threading.Lock] = {}
+        self._key_locks_guard = threading.Lock()
+
+        # In-flight fetches by slug; concurrent batches claiming the same
+        # slug share one network call through these futures.
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
+
+        # One long-lived executor shared by every fetch instead of a pool
+        # per study plan, sized to match the session's connection pool.
+        self._io_executor = ThreadPoolExecutor(
+            max_workers=io_concurrency, thread_name_prefix="lc-io"
+        )
+        self._io_concurrency = io_concurrency
+
+        # Problem inserts flow through one writer thread that batches them,
+        # so network workers pay one queue put per row instead of a write.
+        self._db_queue: queue.Queue = queue.Queue()
+        self._db_writer = threading.Thread(
+            target=self._drain_db_queue, name="lc-db-writer", daemon=True
+        )
+        self._db_writer.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Shut down the shared I/O executor and the database writer thread.
+        """
+        self._io_executor.shutdown(wait=True)
+        self._db_queue.put(None)
+        self._db_writer.join()
+
+    def _lock_for(self, key: str, locks: Dict[str, threading.Lock]) -> threading.Lock:
+        """
+        Get (creating on first use) the lock dedicated to a cache key.
+
+        :param key: The slug or company name the lock covers.
+        :param locks: The per-key lock table to look in.
+        :return: The lock for the key.
+        """
+        with self._key_locks_guard:
+            return locks.setdefault(key, threading.Lock())
+
+    def _drain_db_queue(self) -> None:
+        """
+        Drain queued problems into batched inserts until the sentinel.
+
+        Items are (problem, future) pairs; each batch goes to the database
+        as one set-based insert and the assigned IDs are delivered back
+        through the futures, turning per-row commits into batch commits.
+        """
+        stopping = False
+        while not stopping:
+            item = self._db_queue.get()
+            if item is None:
+                break
+
+            batch = [item]
+            deadline = time.monotonic() + DB_WRITE_INTERVAL_SECONDS
+            while len(batch) < DB_WRITE_BATCH_SIZE:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._db_queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            problems = [problem for problem, _ in batch]
+            try:
+                ids = self.database.insert_problems(problems)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            if len(ids) != len(batch):
+                error = Exception(
+                    "Error inserting problems into the database (Check the logs)"
+                )
+                for _, future in batch:
+                    future.set_exception(error)
+                continue
+
+            for (_, future), problem_id in zip(batch, ids):
+                future.set_result(problem_id)
 
     def _fetch_and_store_problem(self, slug: str) -> Problem:
         """
@@ -85,55 +228,57 @@ class LeetCode:
         :param slug: The slug of the problem.
         :return: The fetched Problem object.
         """
-        print(f"Fetching problem {slug}")
-
-        with self.problems_lock:
-            if slug in self.problems:
-                problem = self.problems[slug]
-                print(f"Problem {problem.slug} already fetched")
+        log.debug("Fetching problem %s", slug)
+
+        # Lock-free fast path: dict reads are atomic under the GIL
+        problem = self.problems.get(slug)
+        if problem is not None:
+            log.debug("Problem %s already fetched", problem.slug)
+            return problem
+
+        with self._lock_for(slug, self._slug_locks):
+            problem = self.problems.get(slug)
+            if problem is not None:
+                log.debug("Problem %s already fetched", problem.slug)
                 return problem
 
-        with self.database_lock:
             if self.database.does_problem_exist(slug):
                 problem = self.database.get_problem_by_slug(slug)
-                print(f"Problem {problem.slug} already fetched")
+            else:
+                problem = None
+            if problem is not None:
+                log.debug("Problem %s already fetched", problem.slug)
                 with self.problems_lock:
                     self.problems[slug] = problem
                 return problem
 
-        question = _fetch_with_retries(lambda: self.client.get_problem_details(slug))
+            question = _fetch_with_retries(
+                lambda: self.client.get_problem_details(slug)
+            )
 
-        if "questionId" not in question:
-            raise Exception("Problem not found")
+            if "questionId" not in question:
+                raise Exception("Problem not found")
 
-        problem_data = {
-            "id": question["questionId"],
-            "title": question["title"],
-            "content": question["content"],
-            "difficulty": question["difficulty"],
-            "topics": (
-                [tag["name"] for tag in question["topicTags"]]
-                if question["topicTags"]
-                else []
-            ),
-            "companies": (
-                [tag["name"] for tag in question["companyTags"]]
-                if question["companyTags"]
-                else []
-            ),
-            "hints": question["hints"] if question["hints"] else [],
-        }
+            problem = _build_problem(question, slug)
 
-        problem = Problem(**problem_data)
+            self._store_problem(slug, problem)
+
+        return problem
+
+    def _store_problem(self, slug: str, problem: Problem) -> None:
+        """
+        Insert a fetched problem into the database and the in-memory cache.
+
+        :param slug: The slug of the problem.
+        :param problem: The Problem object to store.
+        """
+        future: Future = Future()
+        self._db_queue.put((problem, future))
 
         try:
-            with self.database_lock:
-                problem_id = self.database.insert_problem(problem)
+            problem_id = future.result()
         except Exception as e:
-            print(f"Error inserting problem into the database: {e}")
-            problem_id = None
-
-        if problem_id is None:
+            log.error("Error inserting problem into the database: %s", e)
             raise Exception(
                 "Error inserting problem into the database (Check the logs)"
             )
@@ -145,7 +290,122 @@ class LeetCode:
         with self.problems_lock:
             self.problems[slug] = problem  # Store the problem in the dictionary (Cache)
 
-        return problem
+    def _fetch_and_store_problem_batch(self, slugs: List[str]) -> Dict[str, Problem]:
+        """
+        Fetch a batch of problems in one aliased GraphQL request and store them.
+
+        Slugs already present in the in-memory cache or the database are
+        served from there; only the rest hit the network, together.
+
+        :param slugs: The slugs of the problems to fetch.
+        :return: A dictionary mapping each slug to its Problem object.
+        """
+        fetched: Dict[str, Problem] = {}
+        remaining: List[str] = []
+
+        with self.problems_lock:
+            for slug in slugs:
+                cached = self.problems.get(slug)
+                if cached is not None:
+                    fetched[slug] = cached
+                else:
+                    remaining.append(slug)
+
+        if not remaining:
+            return fetched
+
+        # One query hydrates every stored slug in the batch instead of a
+        # membership probe followed by a SELECT per known slug
+        problems_in_database = self.database.get_problems_by_slugs(remaining)
+
+        missing: List[str] = []
+        with self.problems_lock:
+            for slug in remaining:
+                problem = problems_in_database.get(slug)
+                if problem is not None:
+                    self.problems[slug] = problem
+                    fetched[slug] = problem
+                else:
+                    missing.append(slug)
+
+        if not missing:
+            return fetched
+
+        # Claim slugs no other worker is fetching; wait on theirs instead
+        owned: List[str] = []
+        waiting: Dict[str, Future] = {}
+        with self._inflight_lock:
+            for slug in missing:
+                inflight = self._inflight.get(slug)
+                if inflight is None:
+                    self._inflight[slug] = Future()
+                    owned.append(slug)
+                else:
+                    waiting[slug] = inflight
+
+        # Failures from here on are per slug: one removed or renamed slug
+        # must not discard the rest of the batch, so errors are logged and
+        # the partial result is returned.
+        if owned:
+            log.debug("Fetching problems %s", owned)
+
+            try:
+                questions = _fetch_with_retries(
+                    lambda: self.client.get_problems_details_batch(
+                        owned, batch_size=PROBLEM_FETCH_BATCH_SIZE
+                    )
+                )
+            except BaseException as e:
+                # The broad catch only exists to guarantee the in-flight
+                # futures are resolved; KeyboardInterrupt/SystemExit still
+                # propagate once the waiters have been released
+                self._resolve_inflight(owned, error=e)
+                if not isinstance(e, Exception):
+                    raise
+                log.error("Error fetching problems %s: %s", owned, e)
+                questions = None
+
+            if questions is not None:
+                for slug in owned:
+                    question = questions.get(slug)
+                    try:
+                        if question is None or "questionId" not in question:
+                            raise Exception(f"Problem {slug} not found")
+
+                        problem = _build_problem(question, slug)
+
+                        self._store_problem(slug, problem)
+                    except Exception as exc:
+                        log.error("Error fetching problem %s: %s", slug, exc)
+                        self._resolve_inflight([slug], error=exc)
+                        continue
+
+                    fetched[slug] = problem
+                    self._resolve_inflight([slug], problem=problem)
+
+        for slug, inflight in waiting.items():
+            try:
+                fetched[slug] = inflight.result()
+            except Exception as exc:
+                log.error("Error waiting on problem %s: %s", slug, exc)
+
+        return fetched
+
+    def _resolve_inflight(self, slugs: List[str], problem=None, error=None) -> None:
+        """
+        Resolve and retire the in-flight futures for the given slugs.
+
+        :param slugs: The slugs whose futures should be resolved.
+        :param problem: The fetched Problem to deliver, if successful.
+        :param error: The exception to deliver instead, if the fetch failed.
+        """
+        with self._inflight_lock:
+            futures = [self._inflight.pop(slug) for slug in slugs]
+        for future in futures:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(problem)
 
     def get_problem(self, slug: str) -> Problem:
         """
@@ -166,20 +426,33 @@ class LeetCode:
         :param timeframe: The timeframe for questions (e.g., '30d', '3m', '6m').
         :return: A dictionary of fetched Problem objects with the company tag as the key.
         """
+        company_problems = self.companies.get(company)
+        if company_problems is not None:
+            log.info("Company %s problems already fetched", company)
+            return company_problems
+
+        with self._lock_for(company, self._company_locks):
+            return self._fetch_company_problems(company, timeframe)
+
+    def _fetch_company_problems(self, company: str, timeframe: str) -> List[Problem]:
+        """
+        Fetch a company's problems; callers hold the per-company lock.
+
+        :param company: The company tag.
+        :param timeframe: The timeframe for questions (e.g., '30d', '3m', '6m').
+        :return: The list of fetched Problem objects.
+        """
         with self.companies_lock:
             if company in self.companies:
-                print(f"Company {company} problems already fetched")
+                log.info("Company %s problems already fetched", company)
                 return self.companies[company]
 
-        with self.database_lock:
-            if self.database.does_company_exist(company):
-                company_problems = self.database.get_problems_by_company(company)
-                print(f"Company {company} problems already fetched")
-                with self.companies_lock:
-                    self.companies[company] = company_problems
-                return company_problems
-
-        company_problems = []
+        if self.database.does_company_exist(company):
+            company_problems = list(self.database.get_problems_by_company(company))
+            log.info("Company %s problems already fetched", company)
+            with self.companies_lock:
+                self.companies[company] = company_problems
+            return company_problems
 
         # convert 30d, 3m, 6m to 'last-30-days', 'three-months', 'six-months'
         timeframe = convert_time_frame_to_str(timeframe)
@@ -193,10 +466,32 @@ class LeetCode:
         if not questions:
             raise Exception("No problems found for the company")
 
-        for question in questions:
-            slug = question["titleSlug"]
-            problem = self.get_problem(slug) or self._fetch_and_store_problem(slug)
-            company_problems[slug].append(problem)
+        # Deduplicate while keeping the ranking order, then fan the batches
+        # out on the shared executor like the study plan path
+        slugs = list(dict.fromkeys(question["titleSlug"] for question in questions))
+        batches = [
+            slugs[start : start + PROBLEM_FETCH_BATCH_SIZE]
+            for start in range(0, len(slugs), PROBLEM_FETCH_BATCH_SIZE)
+        ]
+
+        problems_by_slug: Dict[str, Problem] = {}
+        future_to_batch = {
+            self._io_executor.submit(self._fetch_and_store_problem_batch, batch): batch
+            for batch in batches
+        }
+        for future in as_completed(future_to_batch):
+            batch = future_to_batch[future]
+            try:
+                problems_by_slug.update(future.result())
+            except Exception as exc:
+                log.error("Error fetching problems %s: %s", batch, exc)
+
+        company_problems: List[Problem] = [
+            problems_by_slug[slug] for slug in slugs if slug in problems_by_slug
+        ]
+
+        # The fetched problems were already committed per batch by the
+        # db-writer thread on its own connection; nothing to commit here.
 
         with self.companies_lock:
             self.companies[company] = company_problems
@@ -213,43 +508,51 @@ class LeetCode:
         :param add_problem_to_study_plan: Function to add a fetched problem to the study plan.
         :param plan_slug: The slug of the study plan.
         """
-        print(
-            "====================================================================================================="
-        )
-        number_of_available_cores = multiprocessing.cpu_count()
-        # number_of_available_cores = 1 # for testing
-        print(f"No. of available threads: {number_of_available_cores}")
-
-        max_threads = min(
-            number_of_available_cores,
-            len(study_plan_data["planSubGroups"][0]["questions"]),
-        )
-        print(
-            f"Using {max_threads} threads to fetch problems for study plan {plan_slug}"
-        )
-        print(
-            "====================================================================================================="
+        log.info(
+            "Fetching problems for study plan %s on %d shared I/O threads",
+            plan_slug,
+            self._io_concurrency,
         )
 
-        # Fetch and store problems using multithreading
-        with ThreadPoolExecutor(max_workers=max_threads) as executor:
-            future_to_slug = {
-                executor.submit(
-                    self._fetch_and_store_problem, question["titleSlug"]
-                ): question["titleSlug"]
+        # Deduplicate while keeping plan order, then batch so each worker
+        # fetches a whole chunk with one aliased request
+        slugs = list(
+            dict.fromkeys(
+                question["titleSlug"]
                 for category in study_plan_data["planSubGroups"]
                 for question in category["questions"]
+            )
+        )
+
+        # Serve already-cached problems inline so they never cost a future
+        with self.problems_lock:
+            cached = {
+                slug: self.problems[slug] for slug in slugs if slug in self.problems
             }
+        for slug, problem in cached.items():
+            add_problem_to_study_plan(slug, problem)
+
+        to_fetch = [slug for slug in slugs if slug not in cached]
+        batches = [
+            to_fetch[start : start + PROBLEM_FETCH_BATCH_SIZE]
+            for start in range(0, len(to_fetch), PROBLEM_FETCH_BATCH_SIZE)
+        ]
+
+        future_to_batch = {
+            self._io_executor.submit(self._fetch_and_store_problem_batch, batch): batch
+            for batch in batches
+        }
 
-            for future in as_completed(future_to_slug):
-                slug = future_to_slug[future]
-                try:
-                    problem = future.result()
-                    print(f"Fetched problem {problem}")
+        for future in as_completed(future_to_batch):
+            batch = future_to_batch[future]
+            try:
+                problems = future.result()
+                for slug, problem in problems.items():
+                    log.debug("Fetched problem %s", problem)
                     add_problem_to_study_plan(slug, problem)
-                    print(f"Added problem {slug} to study plan {plan_slug}")
-                except Exception as exc:
-                    print(f"Error fetching problem {slug}: {exc}")
+                    log.debug("Added problem %s to study plan %s", slug, plan_slug)
+            except Exception as exc:
+                log.error("Error fetching problems %s: %s", batch, exc)
 
     def fetch_and_store_study_plan(self, plan_slug: str) -> StudyPlan:
         """
@@ -260,38 +563,35 @@ class LeetCode:
         """
         if plan_slug in self.study_plans:
             study_plan = self.study_plans[plan_slug]
-            print(f"Study plan {study_plan.name} already fetched")
+            log.info("Study plan %s already fetched", study_plan.name)
             return study_plan
 
-        if self.database.does_study_plan_exist(plan_slug):
-            study_plan = self.database.get_study_plan_by_slug(plan_slug)
-
+        # Count-only lookup: the steady-state completeness check needs two
+        # COUNTs from the plan row, not every problem's multi-KB content
+        study_plan = self.database.get_study_plan_by_slug(plan_slug)
+        if study_plan is not None:
             if (
                 study_plan.number_of_problems is not None
                 and study_plan.number_of_problems
                 == study_plan.expected_number_of_problems
             ):
-                print(f"Study plan {study_plan.name} already fetched")
+                log.info("Study plan %s already fetched", study_plan.name)
 
                 with self.study_plans_lock:
                     self.study_plans[plan_slug] = study_plan
 
-                study_plan.number_of_problems = (
-                    self.database.get_problem_count_by_study_plan(study_plan.slug)
-                )
-                study_plan.number_of_categories = (
-                    self.database.get_category_count_by_study_plan(study_plan.slug)
-                )
-
+                # The counts arrived with the plan row; no extra queries
                 return study_plan
 
-            print(f"Study plan {study_plan.name} has incorrect number of problems")
-            print(f"Re-fetching the missing problems for study plan {study_plan.name}")
-
-            # Fetch the problems for this study plan from the database
-            problems = self.database.get_problems_by_study_plan_slug(study_plan.slug)
+            log.info(
+                "Study plan %s has incorrect number of problems; "
+                "re-fetching the missing problems",
+                study_plan.name,
+            )
 
-            study_plan_data = self.client.get_study_plan_details(study_plan.slug)
+            study_plan_data = _fetch_with_retries(
+                lambda: self.client.get_study_plan_details(study_plan.slug)
+            )
 
             problems_from_study_plan = [
                 question["titleSlug"]
@@ -299,45 +599,62 @@ class LeetCode:
                 for question in category["questions"]
             ]
 
-            # Extract slugs from the existing problems
-            existing_slugs = {problem.slug for problem in problems}
+            # The plan is known incomplete, so paying for the problem rows
+            # (streamed server-side) is now warranted
+            existing_slugs = {
+                problem.slug
+                for problem in self.database.get_problems_by_study_plan_slug(plan_slug)
+            }
 
             # Identify missing problems
             missing_problems = [
                 slug for slug in problems_from_study_plan if slug not in existing_slugs
             ]
 
-            # Fetch and store missing problems
+            # Fetch and store missing problems directly in batches; the
+            # full study-plan pipeline is not needed when only slugs differ
             if missing_problems:
-                print(
-                    f"Fetching {len(missing_problems)} missing problems for study plan {study_plan.name}"
+                log.info(
+                    "Fetching %d missing problems for study plan %s",
+                    len(missing_problems),
+                    study_plan.name,
                 )
 
-                self._fetch_and_store_problems_for_study_plan(
-                    study_plan_data={
-                        "planSubGroups": [
-                            {
-                                "questions": [
-                                    {"titleSlug": slug} for slug in missing_problems
-                                ]
-                            }
-                        ]
-                    },
-                    add_problem_to_study_plan=study_plan.add_problem,
-                    plan_slug=plan_slug,
-                )
-
-                study_plan.number_of_problems = (
-                    self.database.get_problem_count_by_study_plan(study_plan.slug)
-                )
-                study_plan.number_of_categories = (
-                    self.database.get_category_count_by_study_plan(study_plan.slug)
-                )
+                fetched = 0
+                batches = [
+                    missing_problems[start : start + PROBLEM_FETCH_BATCH_SIZE]
+                    for start in range(
+                        0, len(missing_problems), PROBLEM_FETCH_BATCH_SIZE
+                    )
+                ]
+                future_to_batch = {
+                    self._io_executor.submit(
+                        self._fetch_and_store_problem_batch, batch
+                    ): batch
+                    for batch in batches
+                }
+                for future in as_completed(future_to_batch):
+                    batch = future_to_batch[future]
+                    try:
+                        for slug, problem in future.result().items():
+                            study_plan.add_problem(slug, problem)
+                            fetched += 1
+                    except Exception as exc:
+                        log.error("Error fetching problems %s: %s", batch, exc)
+
+                # The re-fetched problems were already committed per batch
+                # by the db-writer thread on its own connection
+
+                # Update the counts from what is in memory instead of
+                # re-querying the database
+                study_plan.number_of_problems = len(existing_slugs) + fetched
 
                 return study_plan
 
         # Fetch the study plan details
-        study_plan_data = self.client.get_study_plan_details(plan_slug)
+        study_plan_data = _fetch_with_retries(
+            lambda: self.client.get_study_plan_details(plan_slug)
+        )
 
         if study_plan_data is None or "name" not in study_plan_data:
             raise Exception("Study plan not found")
@@ -349,44 +666,54 @@ class LeetCode:
             expected_number_of_problems=study_plan_data["totalProblems"],
         )
 
-        with self.database_lock:
+        # The plan row and its join rows commit together (or roll back
+        # together) on this thread's connection; the problem rows travel
+        # through the db-writer thread and commit on its connection
+        with self.database.transaction():
             study_plan_id = self.database.insert_study_plan(study_plan)
-        if study_plan_id is None:
-            raise Exception(
-                "Error inserting study plan into the database (Check the logs)"
+            if study_plan_id is None:
+                raise Exception(
+                    "Error inserting study plan into the database (Check the logs)"
+                )
+
+            pending_study_plan_problems = []
+
+            # One dict build replaces a categories x questions scan per callback
+            slug_to_category = {
+                question["titleSlug"]: category["name"]
+                for category in study_plan_data["planSubGroups"]
+                for question in category["questions"]
+            }
+
+            def add_problem_to_study_plan(slug: str, problem: Problem):
+                category_name = slug_to_category[slug]
+                study_plan.add_problem(category_name, problem)
+                pending_study_plan_problems.append(
+                    (study_plan_id, problem.id, category_name)
+                )
+
+            # Fetch and store all problems for the study plan
+            self._fetch_and_store_problems_for_study_plan(
+                study_plan_data=study_plan_data,
+                add_problem_to_study_plan=add_problem_to_study_plan,
+                plan_slug=plan_slug,
             )
 
-        def add_problem_to_study_plan(slug: str, problem: Problem):
-            for category in study_plan_data["planSubGroups"]:
-                for question in category["questions"]:
-                    if question["titleSlug"] == slug:
-                        study_plan.add_problem(category["name"], problem)
-
-                        with self.database_lock:
-                            response = self.database.insert_study_plan_problem(
-                                study_plan_id, problem.id, category["name"]
-                            )
-                        if response is None:
-                            raise Exception(
-                                "Error inserting study plan problem into the database (Check the logs)"
-                            )
-                        break
-
-        # Fetch and store all problems for the study plan
-        self._fetch_and_store_problems_for_study_plan(
-            study_plan_data=study_plan_data,
-            add_problem_to_study_plan=add_problem_to_study_plan,
-            plan_slug=plan_slug,
-        )
+            # Insert all study plan problems in a single batched statement
+            response = self.database.insert_study_plan_problems(
+                pending_study_plan_problems
+            )
+            if not response:
+                raise Exception(
+                    "Error inserting study plan problems into the database (Check the logs)"
+                )
 
         # Store the study plan in the dictionary
         self.study_plans[plan_slug] = study_plan
 
-        study_plan.number_of_problems = self.database.get_problem_count_by_study_plan(
-            study_plan.slug
-        )
-        study_plan.number_of_categories = (
-            self.database.get_category_count_by_study_plan(study_plan.slug)
-        )
+        # Everything just inserted is still in memory; derive the counts
+        # from the study plan itself instead of two round-trips
+        study_plan.number_of_problems = study_plan.get_number_of_problems()
+        study_plan.number_of_categories = study_plan.get_number_of_categories()
 
         return study_plan
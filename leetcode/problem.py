@@ -1,7 +1,23 @@
 from typing import List
 
+import orjson
+
 
 class Problem:
+    # Problems are instantiated once per fetched row; __slots__ removes the
+    # per-instance __dict__, cutting memory roughly in half for large fetches.
+    __slots__ = (
+        "id",
+        "title",
+        "content",
+        "difficulty",
+        "topics",
+        "companies",
+        "hints",
+        "slug",
+        "link",
+    )
+
     def __init__(
         self,
         id: int,
@@ -11,6 +27,7 @@ class Problem:
         topics: List[str],
         companies: List[str],
         hints: List[str],
+        slug: str = "",
     ):
         self.id = id
         self.title = title
@@ -20,7 +37,9 @@ class Problem:
         self.companies = companies
         self.hints = hints
 
-        self.slug = title.lower().replace(" ", "-")
+        # Deriving the slug from the title is only a fallback; titles with
+        # punctuation do not round-trip, so callers pass the real slug.
+        self.slug = slug or title.lower().replace(" ", "-")
         self.link = f"https://leetcode.com/problems/{self.slug}/"
 
     def to_dict(self):
@@ -36,6 +55,14 @@ class Problem:
             "link": self.link,
         }
 
+    def to_json(self) -> bytes:
+        """
+        Serialize the problem to JSON bytes.
+
+        :return: The orjson-encoded representation of the problem.
+        """
+        return orjson.dumps(self.to_dict())
+
     def __repr__(self):
         return (
             f"Problem(id={self.id}, title={self.title}, difficulty={self.difficulty})"
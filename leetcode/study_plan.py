@@ -2,6 +2,8 @@ from collections import defaultdict
 from enum import Enum
 from typing import List, Dict
 
+import orjson
+
 from leetcode.problem import Problem
 
 
@@ -12,6 +14,19 @@ class Difficulty(Enum):
 
 
 class StudyPlan:
+    __slots__ = (
+        "name",
+        "slug",
+        "description",
+        "expected_number_of_problems",
+        "number_of_problems",
+        "number_of_categories",
+        "problems",
+        "_by_id",
+        "_by_cat",
+        "by_difficulty",
+    )
+
     def __init__(
         self,
         name: str,
@@ -33,8 +48,12 @@ class StudyPlan:
         self.number_of_problems = number_of_problems
         self.number_of_categories = number_of_categories
 
-        self.problems: Dict[int, List[Problem]] = defaultdict(list)
-        self.categories: Dict[str, List[Problem]] = defaultdict(list)
+        # The flat list is the single source of truth; the id and category
+        # maps hold int indices into it rather than duplicate references.
+        self.problems: List[Problem] = []
+        self._by_id: Dict[int, List[int]] = defaultdict(list)
+        self._by_cat: Dict[str, List[int]] = defaultdict(list)
+        self.by_difficulty: Dict[str, List[Problem]] = defaultdict(list)
 
     def add_problem(self, category: str, problem: Problem):
         """
@@ -43,8 +62,11 @@ class StudyPlan:
         :param category: The category of the problem.
         :param problem: The Problem object to add.
         """
-        self.problems[problem.id].append(problem)
-        self.categories[category].append(problem)
+        index = len(self.problems)
+        self.problems.append(problem)
+        self._by_id[problem.id].append(index)
+        self._by_cat[category].append(index)
+        self.by_difficulty[problem.difficulty.lower()].append(problem)
 
     def get_problems_by_id(self, problem_id: int) -> List[Problem]:
         """
@@ -53,7 +75,7 @@ class StudyPlan:
         :param problem_id: The ID of the problems to retrieve.
         :return: A list of Problem objects with the given ID.
         """
-        return self.problems[problem_id]
+        return [self.problems[index] for index in self._by_id[problem_id]]
 
     def get_problems_by_category(self, category: str) -> List[Problem]:
         """
@@ -62,7 +84,7 @@ class StudyPlan:
         :param category: The category of the problems to retrieve.
         :return: A list of Problem objects related to the given category.
         """
-        return self.categories[category]
+        return [self.problems[index] for index in self._by_cat[category]]
 
     def get_number_of_problems(self) -> int:
         """
@@ -70,7 +92,7 @@ class StudyPlan:
 
         :return: The total number of problems.
         """
-        return sum(len(problems) for problems in self.problems.values())
+        return len(self.problems)
 
     def get_number_of_categories(self) -> int:
         """
@@ -78,7 +100,7 @@ class StudyPlan:
 
         :return: The total number of categories.
         """
-        return len(self.categories)
+        return len(self._by_cat)
 
     def get_problems_by_difficulty(self, difficulty: Difficulty) -> List[Problem]:
         """
@@ -87,12 +109,7 @@ class StudyPlan:
         :param difficulty: The difficulty of the problems to retrieve.
         :return: A list of Problem objects related to the given difficulty.
         """
-        return [
-            problem
-            for problems in self.problems.values()
-            for problem in problems
-            if problem.difficulty.lower() == difficulty.value.lower()
-        ]
+        return self.by_difficulty.get(difficulty.value, [])
 
     def to_dict(self):
         return {
@@ -102,6 +119,14 @@ class StudyPlan:
             "expected_number_of_problems": self.expected_number_of_problems,
         }
 
+    def to_json(self) -> bytes:
+        """
+        Serialize the study plan to JSON bytes.
+
+        :return: The orjson-encoded representation of the study plan.
+        """
+        return orjson.dumps(self.to_dict())
+
     def __repr__(self):
         return (
             f"StudyPlan(name={self.name}, "
@@ -1,5 +1,9 @@
 import os
 import argparse
+import logging
+import logging.handlers
+import queue
+
 from dotenv import load_dotenv
 
 from database.database import Database
@@ -13,6 +17,33 @@ from utilities.poetry import get_name, get_description, get_authors, get_version
 load_dotenv()
 
 
+def configure_logging() -> logging.handlers.QueueListener:
+    """
+    Configure non-blocking logging for the fetch worker threads.
+
+    Workers enqueue records onto a QueueHandler (no I/O under the logging
+    lock) and a single QueueListener thread drains them to stderr, so log
+    writes never serialize the thread pool.
+
+    :return: The started QueueListener; callers stop it on shutdown.
+    """
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+
+    handler = logging.StreamHandler()
+    handler.setFormatter(
+        logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+    )
+
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+
+    listener = logging.handlers.QueueListener(log_queue, handler)
+    listener.start()
+
+    return listener
+
+
 def main(args):
     csrf_token = args.csrf_token
     leetcode_session = args.leetcode_session
@@ -28,47 +59,55 @@ def main(args):
             "====================================================================================================="
         )
 
-    configuration = Configuration()
-    configuration.auth["csrf_token"] = csrf_token
-    configuration.auth["leetcode_session"] = leetcode_session
+    listener = configure_logging()
 
-    client = Client(configuration)
-    leetcode = LeetCode(client, database=Database())
+    configuration = Configuration(
+        leetcode_session=leetcode_session or "",
+        csrf_token=csrf_token or "",
+    )
+
+    # The context managers release everything a run holds open: the HTTP
+    # session's pooled connections, the pooled Postgres backend, and the
+    # LeetCode worker threads (executor + DB writer).
+    with Client(configuration) as client, Database() as database, LeetCode(
+        client, database=database
+    ) as leetcode:
+        if plans:
+            for index, plan in enumerate(plans):
+                print(f"Fetching study plan problems: {plan}")
+                try:
+                    study_plan = leetcode.fetch_and_store_study_plan(plan)
+                    print(
+                        "====================================================================================================="
+                    )
+                    print(study_plan)
+                except Exception as e:
+                    print(e)
+
+                if (index + 1) < len(plans):
+                    print(
+                        "====================================================================================================="
+                    )
+
+        if company:
+            timeframe_str = convert_time_frame_to_str(timeframe, format_type="pretty")
+
+            print(
+                f"Fetching company related problems: {company} for the last {timeframe_str}"
+            )
 
-    if plans:
-        for index, plan in enumerate(plans):
-            print(f"Fetching study plan problems: {plan}")
             try:
-                study_plan = leetcode.fetch_and_store_study_plan(plan)
+                company_problems = leetcode.fetch_and_store_company_problems(
+                    company, timeframe
+                )
                 print(
                     "====================================================================================================="
                 )
-                print(study_plan)
+                print(company_problems)
             except Exception as e:
                 print(e)
 
-            if (index + 1) < len(plans):
-                print(
-                    "====================================================================================================="
-                )
-
-    if company:
-        timeframe_str = convert_time_frame_to_str(timeframe, format_type="pretty")
-
-        print(
-            f"Fetching company related problems: {company} for the last {timeframe_str}"
-        )
-
-        try:
-            company_problems = leetcode.fetch_and_store_company_problems(
-                company, timeframe
-            )
-            print(
-                "====================================================================================================="
-            )
-            print(company_problems)
-        except Exception as e:
-            print(e)
+    listener.stop()
 
 
 if __name__ == "__main__":
@@ -49,8 +49,18 @@ class TestDatabase:
 
     def test_insert_study_plan_problem(self, db):
         with patch(
-            "database.database.execute_query", return_value=True
-        ) as mock_execute_query:
+            "database.database.execute_values", return_value=None
+        ) as mock_execute_values:
             result = db.insert_study_plan_problem(1, 1, "Array and Hash Table")
             assert result is True
-            mock_execute_query.assert_called_once()
+            mock_execute_values.assert_called_once()
+
+    def test_insert_study_plan_problems(self, db):
+        rows = [(1, 1, "Array and Hash Table"), (1, 2, "Two Pointers")]
+
+        with patch(
+            "database.database.execute_values", return_value=None
+        ) as mock_execute_values:
+            result = db.insert_study_plan_problems(rows)
+            assert result is True
+            mock_execute_values.assert_called_once()
@@ -50,13 +50,15 @@ class TestLeetCode:
             "get_study_plan_details",
             return_value=mock_study_plan_details,
         ), patch.object(
-            leetcode, "_fetch_and_store_problem", return_value=MagicMock(id=1)
+            leetcode,
+            "_fetch_and_store_problem_batch",
+            return_value={"two-sum": MagicMock(id=1)},
         ), patch.object(
-            leetcode.database, "does_study_plan_exist", return_value=False
+            leetcode.database, "get_study_plan_by_slug", return_value=None
         ), patch.object(
             leetcode.database, "insert_study_plan", return_value=1
         ), patch.object(
-            leetcode.database, "insert_study_plan_problem", return_value=True
+            leetcode.database, "insert_study_plan_problems", return_value=True
         ):
             study_plan = leetcode.fetch_and_store_study_plan(study_plan_slug)
 